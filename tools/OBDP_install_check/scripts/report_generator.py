@@ -9,11 +9,62 @@ from __future__ import annotations
 import argparse
 import json
 import sys
-from datetime import datetime
+from collections.abc import Iterator
+from datetime import datetime, timezone
+from html import escape
 from pathlib import Path
 
 TOOL_ROOT = Path(__file__).resolve().parent.parent
 DEFAULT_REPORTS_DIR = TOOL_ROOT / "reports"
+# Markdown 보고서 줄 단위 기록 시 버퍼 크기
+MD_WRITE_BUFFER = 1 << 20
+
+# HTML 보고서의 정적 부분 (실행마다 동일하므로 모듈 로드 시 한 번만 구성)
+_HTML_HEAD = """<!DOCTYPE html>
+<html lang="ko">
+<head>
+<meta charset="UTF-8">
+<meta name="viewport" content="width=device-width, initial-scale=1.0">
+"""
+
+_HTML_STYLE = """<style>
+  body { font-family: sans-serif; margin: 1rem 2rem; background: #f5f5f5; }
+  h1 { color: #333; }
+  .meta { color: #666; margin-bottom: 1.5rem; }
+  .summary { display: flex; gap: 1rem; margin-bottom: 1.5rem; }
+  .summary span { padding: 0.5rem 1rem; border-radius: 6px; }
+  .summary .total { background: #e3f2fd; }
+  .summary .passed { background: #e8f5e9; }
+  .summary .failed { background: #ffebee; }
+  table { border-collapse: collapse; width: 100%; background: white; box-shadow: 0 1px 3px rgba(0,0,0,0.1); }
+  th, td { border: 1px solid #ddd; padding: 0.5rem 0.75rem; text-align: left; }
+  th { background: #37474f; color: white; }
+  tr.pass { background: #f1f8e9; }
+  tr.fail { background: #ffebee; }
+  .pass { color: #2e7d32; }
+  .fail { color: #c62828; }
+  ul { margin: 0; padding-left: 1.2rem; }
+  li { margin: 0.2rem 0; font-size: 0.9rem; }
+  pre.check-detail { font-size: 0.8rem; max-height: 20em; overflow: auto; white-space: pre-wrap; background: #fafafa; padding: 0.5rem; border: 1px solid #eee; }
+  details { margin-top: 0.25rem; }
+  details summary { cursor: pointer; }
+</style>
+</head>
+<body>
+<h1>OBDP Install Check Report</h1>
+"""
+
+_HTML_TABLE_HEAD = """<table>
+<thead><tr><th>Component</th><th>Status</th><th>Checks</th></tr></thead>
+<tbody>
+"""
+
+_HTML_TAIL = """
+</tbody>
+</table>
+</body>
+</html>
+"""
 
 
 def load_result(result_path: Path) -> dict:
@@ -21,7 +72,19 @@ def load_result(result_path: Path) -> dict:
         return json.load(f)
 
 
-def generate_markdown(data: dict) -> str:
+def generated_at(data: dict) -> str:
+    """보고서 표시용 생성 시각(UTC). 결과의 generated_at 사용, 없으면(이전 결과 파일) 현재 시각."""
+    ts = data.get("generated_at")
+    if not ts:
+        return datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+    try:
+        return datetime.fromisoformat(ts.replace("Z", "+00:00")).strftime("%Y-%m-%d %H:%M:%S")
+    except ValueError:
+        return ts
+
+
+def iter_markdown(data: dict) -> Iterator[str]:
+    """Markdown 보고서를 줄 단위로 생성 (개행 제외). 파일 기록 시 전체 문자열을 만들지 않기 위함."""
     run_id = data.get("run_id", "?")
     hostname = data.get("hostname", "?")
     installer_name = data.get("installer_name", "")
@@ -30,13 +93,13 @@ def generate_markdown(data: dict) -> str:
     passed = summary.get("passed", 0)
     failed = summary.get("failed", 0)
 
-    lines = [
+    yield from (
         "# OBDP Install Check Report",
         "",
         f"- **Run ID**: {run_id}",
         f"- **Hostname**: {hostname}",
         f"- **Installer**: {installer_name}",
-        f"- **Generated**: {datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S')} UTC",
+        f"- **Generated**: {generated_at(data)} UTC",
         "",
         "## Summary",
         "",
@@ -46,114 +109,98 @@ def generate_markdown(data: dict) -> str:
         "",
         "## Component Results",
         "",
-    ]
+    )
     for comp in data.get("components", []):
         status = "PASS" if comp.get("passed") else "FAIL"
-        lines.append(f"### {comp.get('name', comp.get('id'))} — {status}")
-        lines.append("")
+        yield f"### {comp.get('name', comp.get('id'))} — {status}"
+        yield ""
         for ch in comp.get("checks", []):
             ch_status = "✓" if ch.get("passed") else "✗"
             detail = ch.get("detail", "")
-            lines.append(f"- {ch_status} **{ch.get('description', '')}**")
+            yield f"- {ch_status} **{ch.get('description', '')}**"
             if len(detail) > 300:
-                lines.append("")
-                lines.append("```")
-                lines.append(detail)
-                lines.append("```")
-                lines.append("")
+                yield from ("", "```", detail, "```", "")
             else:
-                lines.append(f"  `{detail[:200]}`" if detail else "")
-        lines.append("")
-    return "\n".join(lines)
+                yield f"  `{detail[:200]}`" if detail else ""
+        yield ""
+
+
+def generate_markdown(data: dict) -> str:
+    return "\n".join(iter_markdown(data))
 
 
 def generate_html(data: dict) -> str:
-    run_id = data.get("run_id", "?")
-    hostname = data.get("hostname", "?")
-    installer_name = data.get("installer_name", "")
+    # 결과/설정에서 온 문자열은 모두 동일하게 escape 후 삽입
+    run_id = escape(str(data.get("run_id", "?")), quote=False)
+    hostname = escape(str(data.get("hostname", "?")), quote=False)
+    installer_name = escape(str(data.get("installer_name", "")), quote=False)
     summary = data.get("summary", {})
     total = summary.get("total", 0)
     passed = summary.get("passed", 0)
     failed = summary.get("failed", 0)
     all_passed = failed == 0
 
-    def escape(s: str) -> str:
-        return (s or "").replace("<", "&lt;").replace(">", "&gt;").replace("&", "&amp;")
-
-    rows = []
+    parts: list[str] = []
+    append = parts.append
+    append(_HTML_HEAD)
+    append(f"<title>OBDP Install Check — {run_id}</title>\n")
+    append(_HTML_STYLE)
+    append(f"""<div class="meta">
+  <strong>Run ID</strong>: {run_id} &nbsp;|&nbsp;
+  <strong>Hostname</strong>: {hostname} &nbsp;|&nbsp;
+  <strong>Installer</strong>: {installer_name} &nbsp;|&nbsp;
+  <strong>Generated</strong>: {generated_at(data)} UTC
+</div>
+<div class="summary">
+  <span class="total">Total: {total}</span>
+  <span class="passed">Passed: {passed}</span>
+  <span class="failed">Failed: {failed}</span>
+</div>
+""")
+    append(_HTML_TABLE_HEAD)
     for comp in data.get("components", []):
         status = "PASS" if comp.get("passed") else "FAIL"
         row_class = "pass" if comp.get("passed") else "fail"
-        checks_cells = []
+        append(f'<tr class="{row_class}"><td>{escape(str(comp.get("name") or comp.get("id") or ""), quote=False)}</td><td class="{row_class}">{status}</td><td><ul>')
         for ch in comp.get("checks", []):
             ch_status = "✓" if ch.get("passed") else "✗"
             ch_class = "pass" if ch.get("passed") else "fail"
-            detail = escape(ch.get("detail") or "")
-            if len(detail) > 400:
-                short = detail[:200] + "..."
-                checks_cells.append(
-                    f'<li><span class="{ch_class}">{ch_status} {ch.get("description", "")}</span> '
+            desc = escape(str(ch.get("description") or ""), quote=False)
+            raw_detail = ch.get("detail") or ""
+            detail = escape(raw_detail, quote=False)
+            if len(raw_detail) > 400:
+                # 잘라낸 뒤 escape 해야 엔티티(&amp; 등)가 중간에서 잘리지 않음
+                short = escape(raw_detail[:200], quote=False) + "..."
+                append(
+                    f'<li><span class="{ch_class}">{ch_status} {desc}</span> '
                     f'<details><summary>{short}</summary><pre class="check-detail">{detail}</pre></details></li>'
                 )
             else:
-                checks_cells.append(f'<li><span class="{ch_class}">{ch_status} {ch.get("description", "")}</span> {detail or ""}</li>')
-        rows.append(
-            f'<tr class="{row_class}"><td>{comp.get("name", comp.get("id"))}</td><td class="{row_class}">{status}</td>'
-            f'<td><ul>{"".join(checks_cells)}</ul></td></tr>'
-        )
+                append(f'<li><span class="{ch_class}">{ch_status} {desc}</span> {detail}</li>')
+        append("</ul></td></tr>")
+    append(_HTML_TAIL)
+    return "".join(parts)
 
-    html = f"""<!DOCTYPE html>
-<html lang="ko">
-<head>
-<meta charset="UTF-8">
-<meta name="viewport" content="width=device-width, initial-scale=1.0">
-<title>OBDP Install Check — {run_id}</title>
-<style>
-  body {{ font-family: sans-serif; margin: 1rem 2rem; background: #f5f5f5; }}
-  h1 {{ color: #333; }}
-  .meta {{ color: #666; margin-bottom: 1.5rem; }}
-  .summary {{ display: flex; gap: 1rem; margin-bottom: 1.5rem; }}
-  .summary span {{ padding: 0.5rem 1rem; border-radius: 6px; }}
-  .summary .total {{ background: #e3f2fd; }}
-  .summary .passed {{ background: #e8f5e9; }}
-  .summary .failed {{ background: #ffebee; }}
-  table {{ border-collapse: collapse; width: 100%; background: white; box-shadow: 0 1px 3px rgba(0,0,0,0.1); }}
-  th, td {{ border: 1px solid #ddd; padding: 0.5rem 0.75rem; text-align: left; }}
-  th {{ background: #37474f; color: white; }}
-  tr.pass {{ background: #f1f8e9; }}
-  tr.fail {{ background: #ffebee; }}
-  .pass {{ color: #2e7d32; }}
-  .fail {{ color: #c62828; }}
-  ul {{ margin: 0; padding-left: 1.2rem; }}
-  li {{ margin: 0.2rem 0; font-size: 0.9rem; }}
-  pre.check-detail {{ font-size: 0.8rem; max-height: 20em; overflow: auto; white-space: pre-wrap; background: #fafafa; padding: 0.5rem; border: 1px solid #eee; }}
-  details {{ margin-top: 0.25rem; }}
-  details summary {{ cursor: pointer; }}
-</style>
-</head>
-<body>
-<h1>OBDP Install Check Report</h1>
-<div class="meta">
-  <strong>Run ID</strong>: {run_id} &nbsp;|&nbsp;
-  <strong>Hostname</strong>: {hostname} &nbsp;|&nbsp;
-  <strong>Installer</strong>: {installer_name} &nbsp;|&nbsp;
-  <strong>Generated</strong>: {datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S")} UTC
-</div>
-<div class="summary">
-  <span class="total">Total: {total}</span>
-  <span class="passed">Passed: {passed}</span>
-  <span class="failed">Failed: {failed}</span>
-</div>
-<table>
-<thead><tr><th>Component</th><th>Status</th><th>Checks</th></tr></thead>
-<tbody>
-{"".join(rows)}
-</tbody>
-</table>
-</body>
-</html>
-"""
-    return html
+
+def generate(data: dict, reports_dir: Path, fmt: str = "both") -> dict[str, Path]:
+    """결과 딕셔너리로 보고서 파일 생성, {"md"|"html": 경로} 반환.
+    run_check.py 에서도 결과 JSON을 다시 읽지 않고 직접 호출."""
+    run_id = data.get("run_id", "unknown")
+    reports_dir.mkdir(parents=True, exist_ok=True)
+    written: dict[str, Path] = {}
+
+    if fmt in ("both", "md"):
+        md_path = reports_dir / f"report_{run_id}.md"
+        with md_path.open("w", encoding="utf-8", buffering=MD_WRITE_BUFFER) as f:
+            f.writelines(line + "\n" for line in iter_markdown(data))
+        written["md"] = md_path
+
+    if fmt in ("both", "html"):
+        html_path = reports_dir / f"report_{run_id}.html"
+        html_path.write_text(generate_html(data), encoding="utf-8")
+        written["html"] = html_path
+
+    return written
 
 
 def main() -> int:
@@ -168,23 +215,11 @@ def main() -> int:
         print(f"Result file not found: {result_path}", file=sys.stderr)
         return 1
 
-    data = load_result(result_path)
-    run_id = data.get("run_id", "unknown")
-    reports_dir = Path(args.reports_dir)
-    reports_dir.mkdir(parents=True, exist_ok=True)
-
-    if args.format in ("both", "md"):
-        md_content = generate_markdown(data)
-        md_path = reports_dir / f"report_{run_id}.md"
-        md_path.write_text(md_content, encoding="utf-8")
-        print(f"Markdown report: {md_path}")
-
-    if args.format in ("both", "html"):
-        html_content = generate_html(data)
-        html_path = reports_dir / f"report_{run_id}.html"
-        html_path.write_text(html_content, encoding="utf-8")
-        print(f"HTML report: {html_path}")
-
+    written = generate(load_result(result_path), Path(args.reports_dir), args.format)
+    if "md" in written:
+        print(f"Markdown report: {written['md']}")
+    if "html" in written:
+        print(f"HTML report: {written['html']}")
     return 0
 
 
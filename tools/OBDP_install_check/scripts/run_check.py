@@ -10,9 +10,14 @@ import argparse
 import json
 import logging
 import os
+import re
+import shlex
+import shutil
+import socket
 import subprocess
 import sys
-from datetime import datetime
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timezone
 from pathlib import Path
 
 try:
@@ -21,12 +26,19 @@ except ImportError:
     print("PyYAML 필요: pip install pyyaml", file=sys.stderr)
     sys.exit(1)
 
+try:
+    import orjson  # 선택: 결과 JSON 직렬화 가속 (없으면 표준 json 사용)
+except ImportError:
+    orjson = None
+
 # 스크립트 기준 경로
 SCRIPT_DIR = Path(__file__).resolve().parent
 TOOL_ROOT = SCRIPT_DIR.parent
 CONFIG_PATH = TOOL_ROOT / "config" / "install_components.yaml"
 DEFAULT_LOGS_DIR = TOOL_ROOT / "logs"
 DEFAULT_RESULTS_DIR = TOOL_ROOT / "results"
+# 검증 동시 실행 스레드 수 상한 (각 검증은 subprocess 대기 위주)
+MAX_WORKERS = 32
 
 
 def expand_path(path: str) -> Path:
@@ -53,17 +65,45 @@ def setup_logging(log_dir: Path, run_id: str) -> logging.Logger:
     return logger
 
 
+class CheckLogAdapter(logging.LoggerAdapter):
+    """검증 동시 실행 시 섞여 출력되는 로그 앞에 [컴포넌트/검증] 식별자를 붙임."""
+
+    def process(self, msg, kwargs):
+        return f"[{self.extra['check']}] {msg}", kwargs
+
+
 def load_config(config_path: Path) -> dict:
     with open(config_path, "r", encoding="utf-8") as f:
         return yaml.safe_load(f)
 
 
-def run_cmd(cmd: str, shell: bool = False, timeout: int = 15) -> tuple[int, str, str]:
-    """명령 실행, (returncode, stdout, stderr) 반환."""
+# 이 문자들이 없으면 bash 없이 shlex 분리만으로 동일하게 실행 가능
+# (파이프/리다이렉트/변수/글롭/치환/틸드/주석/환경변수 지정 등)
+SHELL_META = re.compile(r"[;&|<>*?$`()\\\[\]{}~!#=\n]")
+
+
+def needs_shell(cmd: str) -> bool:
+    """shell=True 명령이 실제로 bash가 필요한지 판단.
+    메타문자가 없고 첫 토큰이 PATH상의 실행 파일이면(셸 내장 명령 아님) bash 없이 실행."""
+    if SHELL_META.search(cmd):
+        return True
+    try:
+        argv = shlex.split(cmd)
+    except ValueError:
+        return True
+    return not argv or shutil.which(argv[0]) is None
+
+
+def run_cmd(cmd: str | list[str], shell: bool = False, timeout: int = 15) -> tuple[int, str, str]:
+    """명령 실행, (returncode, stdout, stderr) 반환.
+    cmd는 argv 리스트 또는 문자열. shell=False 이면 문자열은 shlex 규칙으로 분리(따옴표 인자 유지).
+    shell=True 라도 셸 기능이 필요 없는 명령은 bash를 거치지 않고 직접 실행."""
+    if shell and isinstance(cmd, str) and not needs_shell(cmd):
+        shell = False
     try:
         if shell:
             proc = subprocess.run(
-                cmd,
+                cmd if isinstance(cmd, str) else shlex.join(cmd),
                 shell=True,
                 capture_output=True,
                 text=True,
@@ -72,7 +112,7 @@ def run_cmd(cmd: str, shell: bool = False, timeout: int = 15) -> tuple[int, str,
             )
         else:
             proc = subprocess.run(
-                cmd.split(),
+                shlex.split(cmd) if isinstance(cmd, str) else cmd,
                 capture_output=True,
                 text=True,
                 timeout=timeout,
@@ -88,10 +128,44 @@ def run_cmd(cmd: str, shell: bool = False, timeout: int = 15) -> tuple[int, str,
 # active (running): 일반 서비스. active (exited): postgresql 같은 메타/원샷 유닛
 SYSTEMD_ACTIVE_OK = ("Active: active (running)", "Active: active (exited)")
 
+# 여러 유닛을 한 번에 조회할 때 유닛별 블록의 시작 줄
+# UTF-8 로케일: ● 동작/일반, ○ 비활성, × 실패, ↻ 재시작 중
+# UTF-8 이 아닌 로케일: * 동작/일반·비활성·재시작 중, x 실패
+SYSTEMD_UNIT_HEADER = re.compile(r"^[●○×↻*x] (\S+)", re.MULTILINE)
+SYSTEMD_UNIT_SUFFIXES = (".service", ".socket", ".timer", ".target", ".mount", ".path", ".slice", ".scope")
+
+
+def systemd_unit_name(unit: str) -> str:
+    """설정의 유닛 이름을 systemctl 출력 형식(접미사 포함)으로 정규화."""
+    return unit if unit.endswith(SYSTEMD_UNIT_SUFFIXES) else f"{unit}.service"
+
 
-def check_systemd(unit: str, logger: logging.Logger, status_max_chars: int = 2000) -> tuple[bool, str]:
-    """systemctl status 출력으로 정상 동작 여부 판단. detail에 status 전체 포함."""
-    code, out, err = run_cmd(f"systemctl status {unit} --no-pager -l")
+def fetch_systemd_status(units: list[str], logger: logging.Logger) -> dict[str, str]:
+    """systemctl status 를 한 번만 실행해 유닛별 출력 블록으로 분리.
+    출력에 블록이 없는 유닛(미설치, systemd 미동작 등)은 결과에서 빠지며 개별 조회로 처리."""
+    argv = ["systemctl", "status", *units, "--no-pager", "-l"]
+    logger.debug("Run: %s", shlex.join(argv))
+    _, out, _ = run_cmd(argv)
+    headers = list(SYSTEMD_UNIT_HEADER.finditer(out or ""))
+    blocks: dict[str, str] = {}
+    for i, m in enumerate(headers):
+        end = headers[i + 1].start() if i + 1 < len(headers) else len(out)
+        blocks[m.group(1)] = out[m.start():end].strip()
+    return {unit: blocks[systemd_unit_name(unit)] for unit in units if systemd_unit_name(unit) in blocks}
+
+
+def check_systemd(
+    unit: str,
+    logger: logging.Logger,
+    status_max_chars: int = 2000,
+    status: str | None = None,
+) -> tuple[bool, str]:
+    """systemctl status 출력으로 정상 동작 여부 판단. detail에 status 전체 포함.
+    status가 주어지면 (fetch_systemd_status 일괄 조회 결과) 다시 실행하지 않고 그 출력으로 판단."""
+    if status is None:
+        code, out, err = run_cmd(["systemctl", "status", unit, "--no-pager", "-l"])
+    else:
+        out, err = status, ""
     combined = (out or "") + "\n" + (err or "")
     detail = combined.strip() or "no output"
     if len(detail) > status_max_chars:
@@ -103,15 +177,15 @@ def check_systemd(unit: str, logger: logging.Logger, status_max_chars: int = 200
 
 
 def check_command(
-    cmd: str,
+    cmd: str | list[str],
     expect_stdout: str | None,
     expect_stdout_contains: str | None,
     shell: bool,
     description: str,
     logger: logging.Logger,
 ) -> tuple[bool, str]:
-    logger.debug("Run: %s", cmd)
-    if shell:
+    logger.debug("Run: %s", cmd if isinstance(cmd, str) else shlex.join(cmd))
+    if shell and isinstance(cmd, str):
         cmd = os.path.expanduser(cmd)
     code, out, err = run_cmd(cmd, shell=shell)
     combined = (out + "\n" + err).strip()
@@ -145,9 +219,9 @@ def check_path_any(paths: list[str], logger: logging.Logger) -> tuple[bool, str]
 
 def check_journalctl(unit: str, lines: int, logger: logging.Logger, detail_max_chars: int = 3000) -> tuple[bool, str]:
     """journalctl 최근 로그를 가져와 detail에 포함. 정상 수집 시 통과."""
-    cmd = f"journalctl -u {unit} -n {lines} --no-pager"
-    logger.debug("Run: %s", cmd)
-    code, out, err = run_cmd(cmd)
+    argv = ["journalctl", "-u", unit, "-n", str(lines), "--no-pager"]
+    logger.debug("Run: %s", shlex.join(argv))
+    code, out, err = run_cmd(argv)
     combined = (out or "").strip() + "\n" + (err or "").strip()
     detail = combined.strip() or "no output"
     if len(detail) > detail_max_chars:
@@ -155,21 +229,120 @@ def check_journalctl(unit: str, lines: int, logger: logging.Logger, detail_max_c
     return code == 0, detail
 
 
-def run_checks(config: dict, logger: logging.Logger) -> dict:
-    """설정에 따라 모든 검증 실행, 결과 딕셔너리 반환."""
-    run_start = datetime.utcnow().isoformat() + "Z"
-    hostname = run_cmd("hostname")[1] or "unknown"
+def dump_results(results: dict) -> bytes:
+    """결과 딕셔너리를 들여쓰기(2칸) UTF-8 JSON으로 직렬화."""
+    if orjson is not None:
+        return orjson.dumps(results, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(results, ensure_ascii=False, indent=2).encode("utf-8")
+
+
+def is_serial_check(ch: dict) -> bool:
+    """스레드 풀이 아닌 호출 스레드에서 순차 실행해야 하는 검증인지 판단.
+    sudo 명령은 비밀번호 프롬프트가 같은 tty를 쓰므로 동시에 실행하면 한쪽만 입력을 받음
+    (순차 실행 시 두 번째부터는 sudo 자격 캐시 재사용). YAML 에서 parallel: false 로도 지정 가능."""
+    if ch.get("parallel") is False:
+        return True
+    if ch.get("type") != "command":
+        return False
+    cmd = ch.get("cmd", "")
+    if isinstance(cmd, str):
+        try:
+            cmd = shlex.split(cmd)
+        except ValueError:
+            cmd = cmd.split()
+    if not isinstance(cmd, list):
+        # cmd 누락/잘못된 형식은 여기서 판단하지 않고 run_check_item 에서 검증별 FAIL 로 기록
+        return False
+    return "sudo" in cmd
+
+
+def run_check_item(
+    ch: dict,
+    logger: logging.Logger,
+    systemd_status: dict[str, str] | None = None,
+) -> tuple[bool, str]:
+    """검증 항목 1건을 type별로 실행, (passed, detail) 반환.
+    systemd_status: fetch_systemd_status 로 미리 조회한 유닛별 출력 (없으면 개별 조회)."""
+    ch_type = ch.get("type")
+    desc = ch.get("description", ch_type)
+    passed = False
+    detail = ""
+
+    if ch_type == "systemd":
+        unit = ch.get("unit")
+        if unit:
+            passed, detail = check_systemd(unit, logger, status=(systemd_status or {}).get(unit))
+    elif ch_type == "command":
+        passed, detail = check_command(
+            ch.get("cmd", ""),
+            ch.get("expect_stdout"),
+            ch.get("expect_stdout_contains"),
+            ch.get("shell", False),
+            desc,
+            logger,
+        )
+    elif ch_type == "path":
+        path = ch.get("path", "")
+        passed, detail = check_path(path, ch.get("expand_user", False), logger)
+    elif ch_type == "path_any":
+        passed, detail = check_path_any(ch.get("paths", []), logger)
+    elif ch_type == "journalctl":
+        unit = ch.get("unit", "")
+        n_lines = ch.get("lines", 30)
+        if unit:
+            passed, detail = check_journalctl(unit, n_lines, logger)
+        else:
+            passed, detail = False, "journalctl: unit not specified"
+    return passed, detail
+
+
+def run_checks(config: dict, logger: logging.Logger, run_id: str | None = None) -> dict:
+    """설정에 따라 모든 검증 실행, 결과 딕셔너리 반환.
+    run_id는 로그/결과 파일명과 일치하도록 main에서 넘겨받음 (없으면 새로 생성).
+    각 검증은 서로 독립적인 subprocess 대기 위주라 스레드 풀로 동시에 실행하고,
+    결과(PASS/FAIL) 로그는 컴포넌트/검증 순서대로 정리. 실행 중 로그(Run: ...)는
+    완료 순서대로 섞여 출력되므로 [컴포넌트/검증] 접두어로 구분."""
+    run_start = datetime.now(timezone.utc).isoformat(timespec="milliseconds").replace("+00:00", "Z")
+    hostname = socket.gethostname() or "unknown"
     results = {
-        "run_id": datetime.now().strftime("%Y%m%d_%H%M%S"),
+        "run_id": run_id or datetime.now().strftime("%Y%m%d_%H%M%S"),
         "run_start": run_start,
         "hostname": hostname,
         "installer_id": config.get("installer_id", "unknown"),
         "installer_name": config.get("installer_name", ""),
         "components": [],
     }
-    components = config.get("components", [])
+    components = sorted(config.get("components", []), key=lambda c: c.get("order", 99))
+
+    # 전체 검증을 (컴포넌트 index, 검증 항목) 목록으로 펼쳐 한 번에 제출
+    worklist = [(comp_idx, ch) for comp_idx, comp in enumerate(components) for ch in comp.get("checks", [])]
 
-    for comp in sorted(components, key=lambda c: c.get("order", 99)):
+    # systemd 유닛이 여럿이면 systemctl status 를 유닛마다 실행하지 않고 한 번에 조회
+    units = list(dict.fromkeys(ch["unit"] for _, ch in worklist if ch.get("type") == "systemd" and ch.get("unit")))
+    systemd_status = (
+        fetch_systemd_status(units, CheckLogAdapter(logger, {"check": "systemd"})) if len(units) > 1 else {}
+    )
+
+    futures: list[list[Future]] = [[] for _ in components]
+    serial: list[tuple[dict, CheckLogAdapter, Future]] = []
+    with ThreadPoolExecutor(max_workers=max(1, min(MAX_WORKERS, len(worklist)))) as executor:
+        for comp_idx, ch in worklist:
+            comp_id = components[comp_idx].get("id", "?")
+            check_logger = CheckLogAdapter(logger, {"check": f"{comp_id}/{ch.get('description', ch.get('type'))}"})
+            if is_serial_check(ch):
+                future: Future = Future()
+                serial.append((ch, check_logger, future))
+            else:
+                future = executor.submit(run_check_item, ch, check_logger, systemd_status)
+            futures[comp_idx].append(future)
+        # sudo 등 순차 실행 대상은 풀이 나머지를 처리하는 동안 이 스레드에서 하나씩 실행
+        for ch, check_logger, future in serial:
+            try:
+                future.set_result(run_check_item(ch, check_logger, systemd_status))
+            except Exception as e:
+                future.set_exception(e)
+
+    for comp, comp_futures in zip(components, futures):
         comp_id = comp.get("id", "?")
         comp_name = comp.get("name", comp_id)
         logger.info("Checking component: %s (%s)", comp_name, comp_id)
@@ -180,37 +353,13 @@ def run_checks(config: dict, logger: logging.Logger) -> dict:
             "checks": [],
             "passed": True,
         }
-        for ch in comp.get("checks", []):
+        for ch, future in zip(comp.get("checks", []), comp_futures):
             ch_type = ch.get("type")
             desc = ch.get("description", ch_type)
-            passed = False
-            detail = ""
-
-            if ch_type == "systemd":
-                unit = ch.get("unit")
-                if unit:
-                    passed, detail = check_systemd(unit, logger)
-            elif ch_type == "command":
-                passed, detail = check_command(
-                    ch.get("cmd", ""),
-                    ch.get("expect_stdout"),
-                    ch.get("expect_stdout_contains"),
-                    ch.get("shell", False),
-                    desc,
-                    logger,
-                )
-            elif ch_type == "path":
-                path = ch.get("path", "")
-                passed, detail = check_path(path, ch.get("expand_user", False), logger)
-            elif ch_type == "path_any":
-                passed, detail = check_path_any(ch.get("paths", []), logger)
-            elif ch_type == "journalctl":
-                unit = ch.get("unit", "")
-                n_lines = ch.get("lines", 30)
-                if unit:
-                    passed, detail = check_journalctl(unit, n_lines, logger)
-                else:
-                    passed, detail = False, "journalctl: unit not specified"
+            try:
+                passed, detail = future.result()
+            except Exception as e:
+                passed, detail = False, f"check error: {e}"
 
             comp_result["checks"].append({
                 "type": ch_type,
@@ -230,6 +379,8 @@ def run_checks(config: dict, logger: logging.Logger) -> dict:
         "passed": passed_count,
         "failed": len(results["components"]) - passed_count,
     }
+    # 보고서의 생성 시각으로 사용 (보고서를 나중에 다시 만들어도 검증 시각 기준으로 표시)
+    results["generated_at"] = datetime.now(timezone.utc).isoformat(timespec="milliseconds").replace("+00:00", "Z")
     logger.info("Summary: %d passed, %d failed out of %d components",
                 results["summary"]["passed"], results["summary"]["failed"], results["summary"]["total"])
     return results
@@ -255,21 +406,28 @@ def main() -> int:
 
     logger.info("Config: %s", config_path)
     config = load_config(config_path)
-    results = run_checks(config, logger)
+    results = run_checks(config, logger, run_id)
 
     results_dir.mkdir(parents=True, exist_ok=True)
     result_file = results_dir / f"result_{run_id}.json"
-    with open(result_file, "w", encoding="utf-8") as f:
-        json.dump(results, f, ensure_ascii=False, indent=2)
+    # indent 출력은 json.dump 시 작은 write가 많아지므로 bytes로 만든 뒤 한 번에 기록
+    result_file.write_bytes(dump_results(results))
     logger.info("Result JSON: %s", result_file)
 
     if not args.no_report:
-        report_script = SCRIPT_DIR / "report_generator.py"
-        if report_script.exists():
-            subprocess.run(
-                [sys.executable, str(report_script), "--result", str(result_file)],
-                cwd=TOOL_ROOT,
-            )
+        # 별도 인터프리터 실행 없이 같은 프로세스에서 결과 딕셔너리로 바로 보고서 생성
+        if str(SCRIPT_DIR) not in sys.path:
+            sys.path.insert(0, str(SCRIPT_DIR))
+        try:
+            import report_generator
+
+            written = report_generator.generate(results, report_generator.DEFAULT_REPORTS_DIR)
+            if "md" in written:
+                logger.info("Markdown report: %s", written["md"])
+            if "html" in written:
+                logger.info("HTML report: %s", written["html"])
+        except Exception as e:
+            logger.error("Report generation failed: %s", e, exc_info=True)
 
     return 0 if results["summary"]["failed"] == 0 else 2
 